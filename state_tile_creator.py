@@ -1,19 +1,72 @@
-import json
 import os
-import time
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 import numpy as np
+import orjson
 import pandas as pd
 import geopandas as gpd
+from pyogrio import read_dataframe
 from pyproj import Transformer, CRS
-from shapely.geometry import box, Polygon, MultiPolygon, shape, mapping
-from shapely.ops import transform
-from geojson import Feature, Polygon as GeoPolygon
+import shapely
+from shapely.geometry import MultiPolygon, shape, mapping
 import folium
 import matplotlib.pyplot as plt
+from tqdm import tqdm
 
 
+# UTM zone, easting and northing in km, e.g. '32_123_5432'
+_TILE_RE = re.compile(r"^(\d{2})_(\d+)_(\d+)")
+
+# Estimated grid tiles from which worker processes pay off, spawned workers need about a second to import their dependencies
+_PARALLEL_MIN_TILES = 500_000
+
+@lru_cache(maxsize=32)
+def _get_transformer(src_crs, dst_crs, always_xy=True):
+    """
+    Returns a cached transformer, constructing a PROJ pipeline is expensive.
+
+    Args:
+        src_crs (int or str): The source coordinate reference system, as EPSG code or any hashable pyproj CRS input.
+        dst_crs (int or str): The target coordinate reference system, as EPSG code or any hashable pyproj CRS input.
+        always_xy (bool, optional): Whether to use the x/y axis order. Defaults to True.
+
+    Returns:
+        Transformer: The transformer between both coordinate reference systems.
+    """
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=always_xy)
+
+@lru_cache(maxsize=2)
+def _read_state_boundaries(file_path):
+    """
+    Reads a state boundary file once per process, use _load_state_boundaries to get a filtered copy.
+
+    Args:
+        file_path (str): The path to the state boundary GeoJSON file.
+
+    Returns:
+        GeoDataFrame: All state boundaries in the file.
+    """
+    return read_dataframe(file_path)
+
+def _load_state_boundaries(file_path, selected_states=None):
+    """
+    Loads the boundaries of the selected states from the cached state boundary file.
+
+    Args:
+        file_path (str): The path to the state boundary GeoJSON file.
+        selected_states (list, optional): The names of the states to keep. Defaults to None, keeping all states.
+
+    Returns:
+        GeoDataFrame: A copy of the selected state boundaries.
+    """
+    state_geo = _read_state_boundaries(file_path)
+    if selected_states:
+        state_geo = state_geo[state_geo['GEN'].isin(selected_states)]
+    return state_geo.copy()
+
 def load_json(file_path):
     """
     Loads a JSON file from the specified file path.
@@ -24,8 +77,8 @@ def load_json(file_path):
     Returns:
         dict: The loaded JSON data.
     """
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def save_json(file_path, data):
     """
@@ -35,8 +88,8 @@ def save_json(file_path, data):
         file_path (str): The path to the JSON file.
         data (dict): The data to save to the JSON file.
     """
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=4)
+    with open(file_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
 def get_multipolygon_from_geojson(file_path):
     """
@@ -48,13 +101,27 @@ def get_multipolygon_from_geojson(file_path):
     Returns:
         MultiPolygon: A MultiPolygon object containing all polygons and multipolygons from the GeoJSON file.
     """
-    gdf = gpd.read_file(file_path)
+    gdf = gpd.read_file(file_path, engine="pyogrio")
     if gdf.crs != 'EPSG:25832':
         gdf = gdf.to_crs('EPSG:25832')
-    polygons = [geom for geom in gdf.geometry if geom.geom_type in ['Polygon', 'MultiPolygon']]
-    multi_polygon = MultiPolygon([poly for geom in polygons for poly in (geom.geoms if geom.geom_type == 'MultiPolygon' else [geom])])
+    # Flatten all geometries in one call and keep only the polygon parts
+    parts = shapely.get_parts(gdf.geometry.to_numpy())
+    multi_polygon = MultiPolygon(parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON].tolist())
     return multi_polygon
 
+def transform_geometries(geometries, transform_func):
+    """
+    Transforms the coordinates of one or more geometries in a single batched call.
+
+    Args:
+        geometries (Geometry or array_like): The geometry or geometries to transform.
+        transform_func (function): A function transforming arrays of x and y coordinates.
+
+    Returns:
+        Geometry or ndarray: The transformed geometry or geometries.
+    """
+    return shapely.transform(geometries, lambda coords: np.column_stack(transform_func(coords[:, 0], coords[:, 1])))
+
 def create_tiles_within_polygon(polygon, config, data_type, state_name, crs="EPSG:25832"):
     """
     Creates tiles within a given polygon.
@@ -67,92 +134,152 @@ def create_tiles_within_polygon(polygon, config, data_type, state_name, crs="EPS
         crs (str, optional): The coordinate reference system. Defaults to "EPSG:25832".
 
     Returns:
-        list: A list of tuples, each containing a tile name and its coordinates.
+        tuple: A list of tile names and an array of shape (n, 4, 2) with the corner coordinates of each tile.
     """
     tile_info = config[data_type][state_name]['tile_info']
     tile_size = tile_info['tile_size']
     start_x = tile_info['x']
     start_y = tile_info['y']
     min_x, min_y, max_x, max_y = polygon.bounds
-    tiles_in_polygon = []
-
-    x_coords = np.arange(np.floor(min_x / tile_size) * tile_size - start_x, np.ceil(max_x / tile_size) * tile_size + start_x, tile_size)
-    y_coords = np.arange(np.floor(min_y / tile_size) * tile_size - start_y, np.ceil(max_y / tile_size) * tile_size + start_y, tile_size)
-
-    for x in x_coords:
-        for y in y_coords:
-            tile_bbox = box(x, y, x + tile_size, y + tile_size)
-            if tile_bbox.intersects(polygon):
-                tile_name = f"{str(crs)[-2:]}_{int(x // 1000):03}_{int(y // 1000):04}"
-                tile_coords = list(tile_bbox.exterior.coords)[:-1]
-                tiles_in_polygon.append((tile_name, tile_coords))
-    
-    return tiles_in_polygon
 
-def print_progress(state_name, current, total):
-    """
-    Prints the progress of a task.
+    # Build the grid from integer tile indices so the float coordinates cannot drift on large extents
+    x_first, x_last = int(np.floor(min_x / tile_size)), int(np.ceil(max_x / tile_size))
+    y_first, y_last = int(np.floor(min_y / tile_size)), int(np.ceil(max_y / tile_size))
+    x_coords = np.arange(x_first * tile_size - start_x, x_last * tile_size + start_x, tile_size).astype(np.float64)
+    y_coords = np.arange(y_first * tile_size - start_y, y_last * tile_size + start_y, tile_size).astype(np.float64)
 
-    Args:
-        state_name (str): The name of the state.
-        current (int): The current progress value.
-        total (int): The total value for completion.
-    """
-    progress = (current / total) * 100
-    if progress == 100:
-        print(f"\rProgress of state {state_name}:\t100.0% (Completed)")
-    else:
-        print(f"\rProgress of state {state_name}:\t{progress:>4.1f}%", end="", flush=True)
+    xs, ys = (grid.ravel() for grid in np.meshgrid(x_coords, y_coords, indexing="ij"))
+
+    # The grid already spans only the polygon bounds, this just trims the extra start_x/start_y margin columns and rows
+    candidate = (xs + tile_size >= min_x) & (xs <= max_x) & (ys + tile_size >= min_y) & (ys <= max_y)
+    xs, ys = xs[candidate], ys[candidate]
+
+    # Tiles with their center inside the polygon intersect it, only the others need the full GEOS test
+    shapely.prepare(polygon)
+    hit = shapely.contains_xy(polygon, xs + tile_size / 2, ys + tile_size / 2)
+    rest = np.flatnonzero(~hit)
+    tree = shapely.STRtree(shapely.box(xs[rest], ys[rest], xs[rest] + tile_size, ys[rest] + tile_size))
+    hit[rest[tree.query(polygon, predicate="intersects")]] = True
+
+    xs, ys = xs[hit], ys[hit]
+    utm_zone = str(crs)[-2:]
+    x_km, x_index = np.unique((xs // 1000).astype(np.int64), return_inverse=True)
+    y_km, y_index = np.unique((ys // 1000).astype(np.int64), return_inverse=True)
+
+    # Format each grid column and row once, then join them for all tiles in one call
+    x_names = np.array([f"{utm_zone}_{x_name:03}_" for x_name in x_km.tolist()])
+    y_names = np.array([f"{y_name:04}" for y_name in y_km.tolist()])
+    tile_names = np.char.add(x_names[x_index], y_names[y_index]).tolist()
 
-def process_state_tiles(state_row, multi_polygon, config, data_type, crs, transform_func=None, show_progress=True):
+    # Corners of all tiles at once, in the ring order of shapely's box
+    corner_x = np.stack([xs + tile_size, xs + tile_size, xs, xs], axis=-1)
+    corner_y = np.stack([ys, ys + tile_size, ys + tile_size, ys], axis=-1)
+    tile_coords = np.stack([corner_x, corner_y], axis=-1)
+
+    return tile_names, tile_coords
+
+def process_state_tiles(state_name, intersecting_polygon, config, data_type, crs, transform_func=None):
     """
     Processes tiles for a given state.
 
     Args:
-        state_row (GeoSeries): The GeoSeries containing state geometry.
-        multi_polygon (MultiPolygon): The MultiPolygon object for the area of interest.
+        state_name (str): The name of the state.
+        intersecting_polygon (Polygon or MultiPolygon): The part of the area of interest within the state.
         config (dict): The configuration dictionary.
         data_type (str): The type of data.
         crs (str): The coordinate reference system.
         transform_func (function, optional): A function to transform coordinates. Defaults to None.
-        show_progress (bool, optional): Whether to show progress. Defaults to True.
 
     Returns:
         list: A list of dictionaries, each containing tile information.
     """
-    state_name = state_row['GEN']
-    intersecting_polygon = multi_polygon.intersection(state_row['geometry'])
-    if intersecting_polygon.is_empty or intersecting_polygon.bounds is None:
+    if intersecting_polygon.is_empty:
         return []
 
-    tiles = create_tiles_within_polygon(intersecting_polygon, config, data_type, state_name, crs)
-    total_tiles = len(tiles)
-
-    state_tile_list = []
-    for i, (tile_name, tile_coords) in enumerate(tiles):
-        tile_poly = Polygon(tile_coords)
-        if state_row['geometry'].intersects(tile_poly):
-            tile_coords_formatted = [transform_func(x, y) if transform_func else (x, y) for x, y in tile_coords]
-            state_tile_list.append({
-                "tile_name": tile_name,
-                "timestamp": None,
-                "location": None,
-                "format": None,
-                "tile_coords": tile_coords_formatted
-            })
-        if show_progress:
-            print_progress(state_name, i + 1, total_tiles)
-            time.sleep(0.001)
-    return state_tile_list
-
-def display_results(file_path):
-    """
-    Displays the results of tile processing from a JSON file.
+    tile_names, tile_coords = create_tiles_within_polygon(intersecting_polygon, config, data_type, state_name, crs)
+
+    # Transform the corners of all tiles at once instead of point by point
+    if transform_func and tile_names:
+        x, y = transform_func(tile_coords[..., 0].ravel(), tile_coords[..., 1].ravel())
+        tile_coords = np.stack([x, y], axis=-1).reshape(tile_coords.shape)
+
+    # The tiles intersect the AOI part within the state, hence the state itself, no second check is needed
+    return [{
+        "tile_name": tile_name,
+        "timestamp": None,
+        "location": None,
+        "format": None,
+        "tile_coords": tile_coords_formatted
+    } for tile_name, tile_coords_formatted in zip(tile_names, tile_coords.tolist())]
+
+def _create_state_tasks(state_geo, multi_polygon, config, data_type, transform_func=None):
+    """
+    Creates the processing tasks for all states intersecting the area of interest.
+
+    Args:
+        state_geo (GeoDataFrame): The state geometries.
+        multi_polygon (MultiPolygon): The MultiPolygon object for the area of interest in the CRS of the states.
+        config (dict): The configuration dictionary.
+        data_type (str): The type of data.
+        transform_func (function, optional): A function to transform coordinates. Defaults to None.
+
+    Returns:
+        list: A list of task tuples for _process_state_task.
+    """
+    tree = shapely.STRtree(shapely.get_parts(multi_polygon))
+    state_geoms = state_geo.geometry.to_numpy()
+
+    # Query all states at once, the result pairs each state index with the AOI parts it touches
+    state_index, part_index = tree.query(state_geoms, predicate='intersects')
+    hit_states = np.unique(state_index)
+    state_aois = [shapely.unary_union(tree.geometries.take(part_index[state_index == i])) for i in hit_states]
+
+    # Intersect the states with their AOI parts in one vectorized call, only the result is passed on as compact WKB
+    intersections = shapely.to_wkb(shapely.intersection(state_aois, state_geoms[hit_states]))
+    state_names = state_geo['GEN'].to_numpy()[hit_states]
+    return [(state_name, polygon_wkb, config, data_type, state_geo.crs, transform_func) for state_name, polygon_wkb in zip(state_names, intersections)]
+
+def _estimate_grid_tiles(task):
+    """
+    Estimates the number of grid tiles a state task has to test from the bounds of its area of interest part.
 
     Args:
-        file_path (str): The path to the JSON file containing the results.
+        task (tuple): A task tuple created by _create_state_tasks.
+
+    Returns:
+        float: The estimated number of grid tiles.
+    """
+    state_name, polygon_wkb, config, data_type, _, _ = task
+    polygon = shapely.from_wkb(polygon_wkb)
+    if polygon.is_empty:
+        return 0
+    min_x, min_y, max_x, max_y = polygon.bounds
+    tile_size = config[data_type][state_name]['tile_info']['tile_size']
+    return (max_x - min_x) * (max_y - min_y) / tile_size ** 2
+
+def _process_state_task(task):
     """
-    full_data = load_json(file_path)
+    Processes tiles for a given state in a worker process.
+
+    Args:
+        task (tuple): The state name, the part of the area of interest within the state as WKB, the configuration
+            dictionary, the data type, the coordinate reference system and the optional transform function.
+
+    Returns:
+        tuple: The state name and its list of tile dictionaries.
+    """
+    state_name, polygon_wkb, config, data_type, crs, transform_func = task
+    intersecting_polygon = shapely.from_wkb(polygon_wkb)
+    return state_name, process_state_tiles(state_name, intersecting_polygon, config, data_type, crs, transform_func=transform_func)
+
+def display_results(tile_data):
+    """
+    Displays the results of tile processing from a JSON file or the already loaded tile data.
+
+    Args:
+        tile_data (str or dict): The path to the JSON file containing the results, or the results themselves.
+    """
+    full_data = load_json(tile_data) if isinstance(tile_data, str) else tile_data
     data = full_data["tiles"]
     
     if not data:
@@ -192,26 +319,29 @@ def create_json_from_csv(aoi_path, config, init):
     state_name = init["selected_states"][0]
     data_type = init["data_type"]
 
-    transformer = Transformer.from_crs("EPSG:25833", "EPSG:25832", always_xy=True).transform
-    
-    def transform_tile_name(tile_name):
-        pattern = re.match(r"(\d{2})_(\d+)_(\d+)", tile_name)
-        if not pattern:
-            raise ValueError(f"Tile name {tile_name} does not match the expected pattern")
-        
-        crs, x, y = pattern.groups()
-        x, y = int(x), int(y)
-        tile_size = config[data_type][state_name]['tile_info']['tile_size']
-        
-        x_coords = [x * 1000, x * 1000, x * 1000 + tile_size, x * 1000 + tile_size]
-        y_coords = [y * 1000, y * 1000 + tile_size, y * 1000 + tile_size, y * 1000]
-        return [transformer(xx, yy) if crs == '33' else (xx, yy) for xx, yy in zip(x_coords, y_coords)]
+    tile_size = config[data_type][state_name]['tile_info']['tile_size']
+
+    # Parse all tile names at once
+    name_parts = csv['tile_name'].str.extract(_TILE_RE)
+    invalid = name_parts.isna().any(axis=1)
+    if invalid.any():
+        raise ValueError(f"Tile name {csv['tile_name'][invalid].iloc[0]} does not match the expected pattern")
+
+    # Build the four corners of every tile with array arithmetic
+    x = name_parts[1].astype(np.int64).to_numpy() * 1000
+    y = name_parts[2].astype(np.int64).to_numpy() * 1000
+    x_coords = np.stack([x, x, x + tile_size, x + tile_size], axis=-1)
+    y_coords = np.stack([y, y + tile_size, y + tile_size, y], axis=-1)
+    tile_coords = np.stack([x_coords, y_coords], axis=-1).tolist()
+
+    # Transform the corners of all UTM33 tiles in a single call
+    utm33 = np.flatnonzero(name_parts[0] == '33')
+    if utm33.size:
+        x_33, y_33 = _get_transformer(25833, 25832).transform(x_coords[utm33].ravel().astype(float), y_coords[utm33].ravel().astype(float))
+        for index, coords in zip(utm33, np.stack([x_33, y_33], axis=-1).reshape(-1, 4, 2).tolist()):
+            tile_coords[index] = coords
 
-    total = len(csv) - 1
-    tiles = []
-    for index, (_, row) in enumerate(csv.iterrows()):
-        tiles.append({"tile_name": row['tile_name'], "timestamp": None, "location": None, "format": None, "tile_coords": transform_tile_name(row['tile_name'])})
-        print_progress(state_name, index, total)
+    tiles = [{"tile_name": tile_name, "timestamp": None, "location": None, "format": None, "tile_coords": coords} for tile_name, coords in zip(csv['tile_name'], tile_coords)]
 
     return {
         "aoi_name": os.path.basename(init["aoi_path"]),
@@ -228,44 +358,46 @@ def convert_and_save_geojson(meta_path, input_json, target_crs="EPSG:25832"):
         input_json (dict): The input JSON data.
         target_crs (str, optional): The target coordinate reference system. Defaults to "EPSG:25832".
     """
-    crs_src = CRS.from_epsg(25832)
-    crs_dst = CRS.from_epsg(target_crs.split(":")[1])
-    transformer = Transformer.from_crs(crs_src, crs_dst, always_xy=True)
-
-    features = []
-
-    for region, region_data in input_json["tiles"].items():
-        for tile in region_data["tile_list"]:
-            coords = [tuple(transformer.transform(x, y)) for x, y in tile["tile_coords"]]
-            coords.append(coords[0])  # Close the polygon
-
-            polygon = GeoPolygon([coords])
-            feature = Feature(
-                geometry=polygon,
-                properties={
-                    "tile_name": tile["tile_name"],
-                    "state": region,
-                    "timestamp": tile["timestamp"],
-                    "format": tile["format"],
-                    "location": tile["location"]
-                }
-            )
-            features.append(feature)
-    
-    geojson = {
-        "type": "FeatureCollection",
-        "name": input_json["aoi_name"],
-        "crs": {
-            "type": "name",
-            "properties": {
-                "name": f"urn:ogc:def:crs:EPSG::{target_crs.split(':')[1]}"
-            }
-        },
-        "features": features
+    target_epsg = int(target_crs.split(":")[1])
+    transformer = _get_transformer(25832, target_epsg) if target_epsg != 25832 else None
+
+    crs = {
+        "type": "name",
+        "properties": {
+            "name": f"urn:ogc:def:crs:EPSG::{target_crs.split(':')[1]}"
+        }
     }
 
+    tiles = [(region, tile) for region, region_data in input_json["tiles"].items() for tile in region_data["tile_list"]]
+    geometries = []
+    if tiles:
+        # Transform the corners of all tiles in a single call, unless the CRS is unchanged
+        tile_coords = np.array([tile["tile_coords"] for _, tile in tiles], dtype=float)
+        if transformer:
+            x, y = transformer.transform(tile_coords[..., 0].ravel(), tile_coords[..., 1].ravel())
+            tile_coords = np.stack([x, y], axis=-1).reshape(tile_coords.shape)
+
+        # Polygon rings are closed automatically
+        geometries = shapely.to_geojson(shapely.polygons(tile_coords))
+
+    # Stream the features to the file instead of building the whole collection in memory
     geojson_path = os.path.splitext(meta_path)[0] + ".geojson"
-    save_json(geojson_path, geojson)
+    with open(geojson_path, 'wb') as f:
+        f.write(b'{"type": "FeatureCollection", "name": ' + orjson.dumps(input_json["aoi_name"]) + b', "crs": ' + orjson.dumps(crs) + b', "features": [\n')
+        separator = b''
+
+        for (region, tile), geometry in zip(tiles, geometries):
+            properties = {
+                "tile_name": tile["tile_name"],
+                "state": region,
+                "timestamp": tile["timestamp"],
+                "format": tile["format"],
+                "location": tile["location"]
+            }
+            f.write(separator + b'{"type": "Feature", "geometry": ' + geometry.encode() + b', "properties": ' + orjson.dumps(properties, option=orjson.OPT_SERIALIZE_NUMPY) + b'}')
+            separator = b',\n'
+
+        f.write(b'\n]}\n')
 
 def create_folium_map(meta_path, aoi_path):
     """
@@ -275,41 +407,39 @@ def create_folium_map(meta_path, aoi_path):
         meta_path (str): The path to the metadata file.
         aoi_path (str): The path to the area of interest file.
     """
-    with open(meta_path.replace("json", "geojson")) as f:
-        data = json.load(f)
-    
-    with open(aoi_path) as f:
-        aoi_data = json.load(f)
+    data = load_json(meta_path.replace("json", "geojson"))
+    aoi_data = load_json(aoi_path)
+
+    def transform_features(features, transformer):
+        # Transform the coordinates of all features with a single batched call
+        geometries = transform_geometries([shape(feature['geometry']) for feature in features], transformer.transform)
+        for feature, geometry in zip(features, geometries):
+            feature['geometry'] = mapping(geometry)
 
-    def convert_geojson_to_epsg25832(geojson_input):
+    def convert_geojson_to_epsg4326(geojson_input):
         # Detect the input CRS from the GeoJSON
         input_crs = geojson_input.get('crs', {}).get('properties', {}).get('name', None)
         
         if not input_crs:
             raise ValueError("CRS not found in the GeoJSON input")
         
-        # Create the transformer to EPSG:25832
-        transformer = Transformer.from_crs(input_crs, "epsg:25832", always_xy=True)
-        
-        # Function to transform each geometry
-        def transform_geometry(geometry):
-            return transform(transformer.transform, shape(geometry))
+        # Transform all geometries straight to EPSG:4326 for Folium, skipping any intermediate CRS
+        input_epsg = CRS.from_user_input(input_crs).to_epsg()
+        if input_epsg != 4326:
+            transform_features(geojson_input['features'], _get_transformer(input_epsg or input_crs, 4326))
         
-        # Transform all geometries in the GeoJSON
-        for feature in geojson_input['features']:
-            feature['geometry'] = mapping(transform_geometry(feature['geometry']))
-        
-        # Update the CRS to EPSG:25832
+        # Update the CRS to EPSG:4326
         geojson_input['crs'] = {
             "type": "name",
             "properties": {
-                "name": "EPSG:25832"
+                "name": "EPSG:4326"
             }
         }
         
         return geojson_input
 
-    aoi_data = convert_geojson_to_epsg25832(aoi_data)
+    data = convert_geojson_to_epsg4326(data)
+    aoi_data = convert_geojson_to_epsg4326(aoi_data)
 
     # Extract unique states from the data
     states = list(set(feature['properties']['state'] for feature in data['features']))
@@ -318,14 +448,6 @@ def create_folium_map(meta_path, aoi_path):
     colors = [plt.cm.gist_rainbow(i / len(states)) for i in range(len(states))]
     color_map = {state: f'#{int(color[0]*255):02x}{int(color[1]*255):02x}{int(color[2]*255):02x}' for state, color in zip(states, colors)}
 
-    transformer = Transformer.from_crs("EPSG:25832", "EPSG:4326", always_xy=True)
-
-    def transform_coordinates(coordinates):
-        return [transformer.transform(x, y) for x, y in coordinates]
-
-    def transform_polygon(polygon):
-        return [transform_coordinates(ring) for ring in polygon]
-
     def style_function(feature):
         state = feature['properties']['state']
         return {
@@ -343,93 +465,24 @@ def create_folium_map(meta_path, aoi_path):
             'fillOpacity': 0.6,
         }
 
-    for feature in data['features']:
-        if feature['geometry']['type'] == 'Polygon':
-            feature['geometry']['coordinates'] = transform_polygon(feature['geometry']['coordinates'])
-        elif feature['geometry']['type'] == 'MultiPolygon':
-            feature['geometry']['coordinates'] = [transform_polygon(polygon) for polygon in feature['geometry']['coordinates']]
-
-    for feature in aoi_data['features']:
-        if feature['geometry']['type'] == 'Polygon':
-            feature['geometry']['coordinates'] = transform_polygon(feature['geometry']['coordinates'])
-        elif feature['geometry']['type'] == 'MultiPolygon':
-            feature['geometry']['coordinates'] = [transform_polygon(polygon) for polygon in feature['geometry']['coordinates']]
-
-    def calculate_bounding_box(aoi_data):
-        min_lon, min_lat = float('inf'), float('inf')
-        max_lon, max_lat = float('-inf'), float('-inf')
-        
-        for feature in aoi_data['features']:
-            if feature['geometry']['type'] == 'Polygon':
-                for ring in feature['geometry']['coordinates']:
-                    for lon, lat in ring:
-                        min_lon, min_lat = min(min_lon, lon), min(min_lat, lat)
-                        max_lon, max_lat = max(max_lon, lon), max(max_lat, lat)
-            elif feature['geometry']['type'] == 'MultiPolygon':
-                for polygon in feature['geometry']['coordinates']:
-                    for ring in polygon:
-                        for lon, lat in ring:
-                            min_lon, min_lat = min(min_lon, lon), min(min_lat, lat)
-                            max_lon, max_lat = max(max_lon, lon), max(max_lat, lat)
-        
-        return [[min_lat, min_lon], [max_lat, max_lon]]
-
-    aoi_bounds = calculate_bounding_box(aoi_data)
+    # Bounds of all AOI polygons from a single GEOS call
+    min_lon, min_lat, max_lon, max_lat = shapely.total_bounds([shape(feature['geometry']) for feature in aoi_data['features'] if feature['geometry']['type'] in ['Polygon', 'MultiPolygon']]).tolist()
+    aoi_bounds = [[min_lat, min_lon], [max_lat, max_lon]]
 
     m = folium.Map(tiles='CartoDB Positron No Labels')
     m.fit_bounds(aoi_bounds)
 
-    def create_popup(properties):
-        state = properties.get('state', 'N/A')
-        tile_name = properties.get('tile_name', 'N/A')
-        timestamp = properties.get('timestamp', 'N/A')
-        fmt = properties.get('format', 'N/A')
-        popup_content = f"""
-        <table style="width:160px">
-            <tr>
-                <td style="text-align:left"><b>State:</b></td>
-                <td style="text-align:right">{state}</td>
-            </tr>
-            <tr>
-                <td style="text-align:left"><b>Name:</b></td>
-                <td style="text-align:right">{tile_name}</td>
-            </tr>
-            <tr>
-                <td style="text-align:left"><b>Timestamp:</b></td>
-                <td style="text-align:right">{timestamp}</td>
-            </tr>
-            <tr>
-                <td style="text-align:left"><b>Format:</b></td>
-                <td style="text-align:right">{fmt}</td>
-            </tr>
-        </table>
-        """
-        return folium.Popup(popup_content, max_width=250)
-
+    # One GeoJson layer per state, popups are rendered client-side from the feature properties
     for state in states:
         state_fg = folium.FeatureGroup(name=state)
-        for feature in data['features']:
-            if feature['properties']['state'] == state:
-                coords = feature['geometry']['coordinates']
-                if feature['geometry']['type'] == 'Polygon':
-                    folium.GeoJson(
-                        feature,
-                        style_function=style_function,
-                        smooth_factor=0,
-                        zoom_on_click=False,
-                        highlight_function=lambda x: {'weight': 5, 'color': 'yellow'},
-                        popup=create_popup(feature['properties'])
-                    ).add_to(state_fg)
-                elif feature['geometry']['type'] == 'MultiPolygon':
-                    for polygon in coords:
-                        folium.GeoJson(
-                            {'type': 'Feature', 'geometry': {'type': 'Polygon', 'coordinates': polygon}, 'properties': feature['properties']},
-                            style_function=style_function,
-                            smooth_factor=0,
-                            zoom_on_click=False,
-                            highlight_function=lambda x: {'weight': 5, 'color': 'yellow'},
-                            popup=create_popup(feature['properties'])
-                        ).add_to(state_fg)
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': [feature for feature in data['features'] if feature['properties']['state'] == state]},
+            style_function=style_function,
+            smooth_factor=0,
+            zoom_on_click=False,
+            highlight_function=lambda x: {'weight': 5, 'color': 'yellow'},
+            popup=folium.GeoJsonPopup(fields=['state', 'tile_name', 'timestamp', 'format'], aliases=['State:', 'Name:', 'Timestamp:', 'Format:'], labels=True, max_width=250)
+        ).add_to(state_fg)
         state_fg.add_to(m)
 
     aoi_fg = folium.FeatureGroup(name="AOI")
@@ -443,7 +496,7 @@ def create_folium_map(meta_path, aoi_path):
 
     folium.LayerControl().add_to(m)
 
-    legend_html = '''
+    legend_header = '''
          <div style="
          position: fixed; 
          bottom: 50px; left: 50px; width: 75px; height: auto; 
@@ -454,12 +507,11 @@ def create_folium_map(meta_path, aoi_path):
          ">
          <b>States</b><br>
     '''
-    for state, color in color_map.items():
-        legend_html += f'''
+    legend_entries = [f'''
         <i style="background: {color}; width: 10px; height: 10px; display: inline-block; opacity: 0.5;"></i>
         {state}<br>
-        '''
-    legend_html += '</div>'
+        ''' for state, color in color_map.items()]
+    legend_html = ''.join([legend_header, *legend_entries, '</div>'])
 
     # Step 3: Add the Legend to the Map
     legend = folium.Element(legend_html)
@@ -488,39 +540,45 @@ def create_state_tile_file(init, config):
         full_data = load_json(meta_path)
         if full_data["aoi_name"] == os.path.basename(aoi_path) and full_data["data_type"] == data_type:
             print(f"Tile data file for '{full_data['aoi_name']}' ({data_type}) already exists.\nProceeding with the existing file.")
-            display_results(meta_path)
+            display_results(full_data)
             return
     else:
         os.makedirs(os.path.dirname(meta_path), exist_ok=True)
 
     selected_states = selected_states or []
     state_files_dir = 'bdl'
-    state_geo_25832 = gpd.read_file(os.path.join(state_files_dir, 'DE_bdl_utm32.geojson'))
-    state_geo_25833 = gpd.read_file(os.path.join(state_files_dir, 'DE_bdl_utm33.geojson'))
-    
+
     state_tiles = {"aoi_name": os.path.basename(aoi_path), "data_type": data_type, "tiles": {}}
-    transform_25832_to_25833 = Transformer.from_crs(state_geo_25832.crs, state_geo_25833.crs, always_xy=True).transform
-    transform_25833_to_25832 = Transformer.from_crs(state_geo_25833.crs, state_geo_25832.crs, always_xy=True).transform
 
     if aoi_path.endswith(".csv"):
         state_tiles = create_json_from_csv(aoi_path, config, init)
     else:
         aoi_multi_polygon = get_multipolygon_from_geojson(aoi_path)
-        for _, state_row in state_geo_25832.iterrows():
-            state_name = state_row['GEN']
-            if not selected_states or state_name in selected_states:
-                state_tiles["tiles"][state_name] = {"data_type": data_type, "tile_list": process_state_tiles(state_row, aoi_multi_polygon, config, data_type, state_geo_25832.crs)}
-
-        aoi_multi_polygon_25833 = transform(transform_25832_to_25833, aoi_multi_polygon)
-        for _, state_row in state_geo_25833.iterrows():
-            state_name = state_row['GEN']
-            if not selected_states or state_name in selected_states:
-                state_tiles["tiles"][state_name] = {"data_type": data_type, "tile_list": process_state_tiles(state_row, aoi_multi_polygon_25833, config, data_type, state_geo_25833.crs, transform_func=transform_25833_to_25832)}
+        aoi_multi_polygon_25833 = transform_geometries(aoi_multi_polygon, _get_transformer(25832, 25833).transform)
+        state_geo_25832 = _load_state_boundaries(os.path.join(state_files_dir, 'DE_bdl_utm32.geojson'), selected_states)
+        state_geo_25833 = _load_state_boundaries(os.path.join(state_files_dir, 'DE_bdl_utm33.geojson'), selected_states)
+
+        # Every selected state gets an entry, also the ones outside the AOI which end up without tiles
+        for state_name in [*state_geo_25832['GEN'], *state_geo_25833['GEN']]:
+            state_tiles["tiles"][state_name] = {"data_type": data_type, "tile_list": []}
+
+        # States are independent, process the ones touching the AOI in parallel
+        tasks = _create_state_tasks(state_geo_25832, aoi_multi_polygon, config, data_type)
+        tasks += _create_state_tasks(state_geo_25833, aoi_multi_polygon_25833, config, data_type, transform_func=_get_transformer(25833, 25832).transform)
+        # Small AOIs are processed inline, starting the worker processes would take longer than the work itself
+        if len(tasks) > 1 and sum(_estimate_grid_tiles(task) for task in tasks) >= _PARALLEL_MIN_TILES:
+            with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+                results = list(tqdm(executor.map(_process_state_task, tasks), total=len(tasks), desc="States", disable=not sys.stderr.isatty()))
+        else:
+            results = [_process_state_task(task) for task in tasks]
+
+        for state_name, tile_list in results:
+            state_tiles["tiles"][state_name] = {"data_type": data_type, "tile_list": tile_list}
 
     save_json(meta_path, state_tiles)
     convert_and_save_geojson(meta_path, state_tiles)
     create_folium_map(meta_path, aoi_path)
-    display_results(meta_path)
+    display_results(state_tiles)
 
 # Main entry point
 if __name__ == "__main__":
@@ -528,8 +586,3 @@ if __name__ == "__main__":
     init = load_json('init.json')
 
     create_state_tile_file(init, config)
-
-    tiles_data = load_json(init['meta_path'])
-    convert_and_save_geojson(init['meta_path'], tiles_data)
-
-    create_folium_map(init['meta_path'], init['aoi_path'])